@@ -1,80 +1,442 @@
+import os
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
 
 # Konfigurasi halaman
 st.set_page_config(page_title="Superstore Analytics Dashboard", layout="wide", page_icon="📊")
 
+DATA_FILE = 'superstore_order.xlsx'
+CACHE_FILE = 'superstore_order.parquet'
+# Versi kode untuk cache disk load_data: berubah tiap kali file ini diubah/di-deploy ulang,
+# supaya hasil pickle dari kode lama (aggs dengan key lama, dsb.) tidak terpakai lagi
+CODE_VERSION = os.path.getmtime(__file__)
+
+# Hanya kolom yang dipakai dashboard yang dibaca dari file
+NEEDED_COLS = ['order_id', 'order_date', 'ship_date', 'ship_mode', 'customer_id', 'customer_name',
+               'state', 'region', 'product_name', 'sales', 'quantity', 'discount', 'profit']
+# Metadata Parquet: daftar NEEDED_COLS saat cache ditulis
+CACHE_COLS_KEY = b'dashboard_needed_cols'
+
+# Palet warna pie chart
+REGION_PIE_COLORS = px.colors.sequential.RdBu
+SHIP_MODE_PIE_COLORS = px.colors.sequential.Plasma
+
+def normalize_column(name):
+    """Rename kolom: ganti spasi dengan underscore dan lowercase"""
+    return str(name).strip().replace(' ', '_').lower()
+
+def read_excel_rows(path):
+    """Baca sheet pertama baris per baris (openpyxl read_only), hanya kolom di NEEDED_COLS"""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        # Tag <dimension> bisa basi atau tidak ada, jadi ukuran sheet dihitung ulang dari isinya
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        first = next(rows, None)
+        if first is None:
+            raise ValueError(f"Sheet pertama di '{path}' kosong")
+        header = [normalize_column(c) for c in first]
+        keep = [i for i, c in enumerate(header) if c in NEEDED_COLS]
+        data = []
+        for row in rows:
+            # Baris yang lebih pendek (sel kosong di ujung) diisi None
+            values = [row[i] if i < len(row) else None for i in keep]
+            # Lewati baris kosong di akhir sheet
+            if any(v is not None for v in values):
+                data.append(values)
+    finally:
+        wb.close()
+    return pd.DataFrame(data, columns=[header[i] for i in keep])
+
+def read_orders():
+    """Baca data order, pakai cache Parquet selama masih lebih baru dari file Excel"""
+    if os.path.exists(CACHE_FILE) and os.path.getmtime(CACHE_FILE) >= os.path.getmtime(DATA_FILE):
+        schema = pq.read_schema(CACHE_FILE)
+        # Cache yang dibuat dengan daftar NEEDED_COLS lain dibuat ulang dari Excel.
+        # Kolom yang memang tidak ada di Excel juga tidak ada di cache, jadi cukup baca yang tersedia.
+        if (schema.metadata or {}).get(CACHE_COLS_KEY) == ','.join(NEEDED_COLS).encode():
+            # Parquet sudah menyimpan tipe kolom, tidak perlu konversi ulang
+            return pd.read_parquet(CACHE_FILE, columns=[c for c in NEEDED_COLS if c in schema.names])
+    
+    df = read_excel_rows(DATA_FILE)
+    
+    # Convert numeric columns
+    numeric_cols = [c for c in ['sales', 'profit', 'quantity', 'discount'] if c in df.columns]
+    df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce')
+    
+    # Convert date columns
+    date_cols = [c for c in ['order_date', 'ship_date'] if c in df.columns]
+    df[date_cols] = df[date_cols].apply(pd.to_datetime, errors='coerce')
+    
+    # Cache hanya pelengkap: kalau gagal ditulis (folder read-only, kolom bertipe campuran
+    # yang ditolak pyarrow, dll.) dashboard tetap jalan tanpa cache.
+    # Ditulis ke file sementara dulu supaya file cache yang setengah jadi tidak pernah terbaca.
+    tmp_file = CACHE_FILE + '.tmp'
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**table.schema.metadata,
+                                               CACHE_COLS_KEY: ','.join(NEEDED_COLS).encode()})
+        pq.write_table(table, tmp_file, compression='zstd')
+        os.replace(tmp_file, CACHE_FILE)
+    except Exception:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+    
+    return df
+
+# Agregasi per halaman, dihitung sekali saat data dimuat (lihat build_aggregates).
+# sort=False hanya dipakai kalau hasilnya diurutkan/di-rank lagi sesudahnya.
+def order_level(df):
+    """Satu baris per order_id, untuk menghitung jumlah order tanpa nunique"""
+    cols = [c for c in ['order_id', 'customer_id', 'customer_name', 'region', 'order_date', 'ship_mode']
+            if c in df.columns]
+    return df.drop_duplicates('order_id')[cols]
+
+def margin_pct(profit, sales):
+    """Profit margin (%) tanpa temporary NaN/inf; 0 kalau sales-nya 0"""
+    profit = profit.to_numpy(dtype='float64')
+    sales = sales.to_numpy(dtype='float64')
+    out = np.zeros(len(sales))
+    np.divide(profit, sales, out=out, where=sales != 0)
+    out *= 100
+    return out
+
+def region_sales(df):
+    return df.groupby('region', as_index=False, observed=True)['sales'].sum()
+
+def shipping_days_by_mode(df):
+    return df.groupby('ship_mode', as_index=False, observed=True)['shipping_days'].mean()
+
+def product_summary(df):
+    """Satu groupby product_name untuk semua tabel produk (top products, margin, quantity, discount)"""
+    spec = {'sales': ('sales', 'sum'), 'profit': ('profit', 'sum')}
+    if 'quantity' in df.columns:
+        spec['quantity'] = ('quantity', 'sum')
+    if 'discount' in df.columns:
+        spec['avg_discount'] = ('discount', 'mean')
+        spec['avg_profit'] = ('profit', 'mean')
+    return df.groupby('product_name', as_index=False, observed=True).agg(**spec)
+
+def top_products(products, col, n=10):
+    return products.nlargest(n, col)[['product_name', col]]
+
+def product_margin(products):
+    return products[['product_name', 'sales', 'profit']].assign(
+        profit_margin=margin_pct(products['profit'], products['sales']))
+
+def customer_ranking(df, orders, n=15):
+    # Jumlah order dari tabel order (size, bukan nunique), sales/profit dari df, lalu digabung.
+    # Group pakai customer_id; nama customer baru ditempel ke hasil top-N
+    key = 'customer_id' if 'customer_id' in df.columns else 'customer_name'
+    order_counts = orders.groupby(key, as_index=False, observed=True, sort=False).size()
+    order_counts = order_counts.rename(columns={'size': 'total_orders'})
+    totals = df.groupby(key, as_index=False, observed=True, sort=False)[['sales', 'profit']].sum()
+    totals = totals.rename(columns={'sales': 'total_sales', 'profit': 'total_profit'})
+    customer_df = order_counts.merge(totals, on=key).nlargest(n, 'total_sales')
+    if key != 'customer_name':
+        names = orders.drop_duplicates(key)
+        names = dict(zip(names[key], names['customer_name']))
+        customer_df.insert(0, 'customer_name', customer_df.pop(key).map(names))
+    return customer_df
+
+def state_sales(df, n=10):
+    return df.groupby('state', as_index=False, observed=True, sort=False)['sales'].sum().nlargest(n, 'sales')
+
+def product_quantity(products):
+    return products[['product_name', 'quantity', 'sales', 'profit']].rename(
+        columns={'quantity': 'total_quantity', 'sales': 'total_sales', 'profit': 'total_profit'})
+
+def discount_impact(products, n=15):
+    # Ambil top-N dulu, baru konversi persen di hasil yang kecil
+    top = products.nlargest(n, 'avg_profit')[['product_name', 'avg_discount', 'avg_profit']]
+    return top.assign(avg_discount=(top['avg_discount'].astype('float64') * 100).round(2))
+
+def shipping_summary(df):
+    shipping_df = df.groupby('ship_mode', as_index=False, observed=True, sort=False).agg(
+        total_orders=('order_id', 'count'),
+        avg_shipping_days=('shipping_days', 'mean'),
+        total_sales=('sales', 'sum')
+    )
+    shipping_df['avg_shipping_days'] = shipping_df['avg_shipping_days'].round(1)
+    return shipping_df.sort_values('avg_shipping_days')
+
+def monthly_trend(df, orders):
+    # Group pakai kunci integer YYYYMM, format 'YYYY-MM' baru dibuat di hasil yang kecil
+    year_month = df['order_date'].dt.year * 100 + df['order_date'].dt.month
+    order_month = orders['order_date'].dt.year * 100 + orders['order_date'].dt.month
+    monthly_sales = df.groupby(year_month.rename('_ym')).agg(
+        total_sales=('sales', 'sum'),
+        total_profit=('profit', 'sum')
+    )
+    monthly_sales['total_orders'] = orders.groupby(order_month).size()
+    monthly_sales = monthly_sales.reset_index()
+    ym = monthly_sales.pop('_ym').astype(int).astype(str)
+    monthly_sales.insert(0, 'month', pd.to_datetime(ym, format='%Y%m').dt.strftime('%Y-%m'))
+    monthly_sales['profit_margin'] = margin_pct(monthly_sales['total_profit'], monthly_sales['total_sales']).round(2)
+    return monthly_sales
+
+def build_aggregates(df):
+    """Hitung semua agregasi yang ditampilkan di tiap halaman"""
+    orders = order_level(df)
+    totals = df[['sales', 'profit']].sum()
+    aggs = {'total_sales': totals['sales'], 'total_profit': totals['profit'], 'total_orders': len(orders)}
+    if 'region' in df.columns:
+        aggs['region_sales'] = region_sales(df)
+    if 'ship_mode' in df.columns and 'shipping_days' in df.columns:
+        aggs['shipping_days'] = shipping_days_by_mode(df)
+        aggs['shipping'] = shipping_summary(df)
+    if 'product_name' in df.columns:
+        products = product_summary(df)
+        aggs['top_sales'] = top_products(products, 'sales')
+        aggs['top_profit'] = top_products(products, 'profit')
+        aggs['product_margin'] = product_margin(products)
+        if 'quantity' in df.columns:
+            product_qty = product_quantity(products)
+            aggs['top_qty'] = product_qty.nlargest(15, 'total_quantity')
+            aggs['top_product_sales'] = product_qty.nlargest(20, 'total_sales')
+        if 'discount' in df.columns:
+            aggs['discount'] = discount_impact(products)
+    if 'customer_name' in df.columns:
+        aggs['customers'] = customer_ranking(df, orders)
+    if 'state' in df.columns:
+        aggs['state_sales'] = state_sales(df)
+    if 'order_date' in df.columns:
+        aggs['monthly'] = monthly_trend(df, orders)
+    return aggs
+
 # Load data dari 1 file Excel
-@st.cache_data
-def load_data():
-    """Load data dari single Excel file"""
+# persist="disk": hasil load tetap ada walau server Streamlit di-restart
+@st.cache_data(persist="disk")
+def load_data(mtime, code_version):
+    """Load data dari single Excel file beserta semua agregasinya
+
+    mtime & code_version hanya dipakai sebagai cache key supaya cache ikut berganti saat
+    file data atau kode dashboard diubah. Kalau gagal, exception dilempar (tidak ikut di-cache).
+    """
+    df = read_orders()
+    
+    # Lama pengiriman dihitung sekali di sini, bukan di tiap halaman
+    # (langsung di numpy; floor dari pembagian biasa supaya NaT tetap jadi NaN, bukan 0)
+    if {'ship_date', 'order_date'}.issubset(df.columns):
+        elapsed = df['ship_date'].to_numpy() - df['order_date'].to_numpy()
+        df['shipping_days'] = np.floor(elapsed / np.timedelta64(1, 'D'))
+    
+    # Perkecil tipe numerik. sales/profit tetap float64 karena totalnya ditampilkan sampai sen
+    if 'discount' in df.columns:
+        df['discount'] = df['discount'].astype('float32')
+    # int16 hanya kalau semua nilai muat: astype tidak error saat overflow, nilainya jadi salah
+    # (mis. ship date salah ketik 90 tahun ke depan), jadi selain itu tipe aslinya dipertahankan
+    int16 = np.iinfo('int16')
+    for col in ['quantity', 'shipping_days']:
+        if col in df.columns:
+            if df[col].isna().any():
+                df[col] = df[col].astype('float32')
+            elif df[col].between(int16.min, int16.max).all():
+                df[col] = df[col].astype('int16')
+    
+    # Kolom teks yang nilainya berulang disimpan sebagai category
+    category_cols = ['region', 'ship_mode', 'state', 'customer_id', 'customer_name', 'product_name']
+    for col in category_cols:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    
+    return df, build_aggregates(df)
+
+# Figure Plotly di-cache: input-nya tabel agregat kecil, jadi hashing-nya murah
+@st.cache_resource
+def fig_region_pie(region_sales):
+    return px.pie(region_sales, values='sales', names='region', 
+                  title='Distribution of Sales by Region',
+                  color_discrete_sequence=REGION_PIE_COLORS)
+
+@st.cache_resource
+def fig_shipping_days(shipping):
+    fig = px.bar(shipping, x='ship_mode', y='shipping_days',
+                 title='Average Shipping Days by Mode',
+                 color='shipping_days',
+                 color_continuous_scale='Reds')
+    fig.update_layout(xaxis_title="Shipping Mode", yaxis_title="Days")
+    return fig
+
+@st.cache_resource
+def fig_top_products(top_products, col, color_scale, title):
+    fig = px.bar(top_products, x=col, y='product_name',
+                 orientation='h',
+                 color=col,
+                 color_continuous_scale=color_scale,
+                 title=title)
+    fig.update_layout(yaxis={'categoryorder':'total ascending'})
+    return fig
+
+@st.cache_resource
+def fig_sales_vs_profit(product_analysis):
+    # For size parameter, use absolute sales (always positive)
+    # Filter out any rows with invalid data
+    plot_data = product_analysis[product_analysis['sales'] > 0].head(50)
+    
+    return px.scatter(plot_data, x='sales', y='profit',
+                      size='sales',  # Use sales for size (always positive)
+                      hover_data=['product_name', 'profit_margin'],
+                      title='Sales vs Profit (Top 50 Products)',
+                      color='profit_margin',
+                      color_continuous_scale='RdYlGn')
+
+@st.cache_resource
+def fig_customer_bar(customer_df, col, color_scale, title):
+    fig = px.bar(customer_df, x='customer_name', y=col,
+                 color=col,
+                 color_continuous_scale=color_scale,
+                 title=title)
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+@st.cache_resource
+def fig_state_sales(state_sales):
+    return px.bar(state_sales, x='state', y='sales',
+                  color='sales',
+                  color_continuous_scale='Plasma',
+                  title='Top 10 States by Sales')
+
+@st.cache_resource
+def fig_top_quantity(top_qty):
+    fig = px.bar(top_qty, x='product_name', y='total_quantity',
+                 color='total_quantity',
+                 color_continuous_scale='Oranges',
+                 title='Most Sold Products')
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+@st.cache_resource
+def fig_discount_impact(discount_analysis):
+    return px.scatter(discount_analysis, x='avg_discount', y='avg_profit',
+                      hover_data=['product_name'],
+                      title='Discount vs Profit',
+                      labels={'avg_discount': 'Avg Discount (%)', 
+                             'avg_profit': 'Avg Profit ($)'})
+
+@st.cache_resource
+def fig_shipping_speed(shipping_df):
+    fig = px.bar(shipping_df, x='ship_mode', y='avg_shipping_days',
+                 color='avg_shipping_days',
+                 color_continuous_scale='RdYlGn_r',
+                 title='Delivery Speed by Shipping Mode',
+                 text='avg_shipping_days')
+    fig.update_traces(texttemplate='%{text:.1f} days', textposition='outside')
+    return fig
+
+@st.cache_resource
+def fig_shipping_orders(shipping_df):
+    return px.pie(shipping_df, values='total_orders', names='ship_mode',
+                  title='Orders by Shipping Mode',
+                  color_discrete_sequence=SHIP_MODE_PIE_COLORS)
+
+@st.cache_resource
+def fig_shipping_sales(shipping_df):
+    return px.bar(shipping_df, x='ship_mode', y='total_sales',
+                  color='total_sales',
+                  color_continuous_scale='Greens',
+                  title='Revenue by Shipping Method')
+
+@st.cache_resource
+def fig_monthly_trend(monthly_sales):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=monthly_sales['month'], y=monthly_sales['total_sales'],
+                             mode='lines+markers', name='Sales',
+                             line=dict(color='blue', width=2)))
+    fig.add_trace(go.Scatter(x=monthly_sales['month'], y=monthly_sales['total_profit'],
+                             mode='lines+markers', name='Profit',
+                             line=dict(color='green', width=2)))
+    fig.update_layout(title='Sales & Profit Over Time',
+                      xaxis_title='Month',
+                      yaxis_title='Amount ($)',
+                      hovermode='x unified')
+    return fig
+
+@st.cache_resource
+def fig_monthly_orders(monthly_sales):
+    fig = px.bar(monthly_sales, x='month', y='total_orders',
+                 title='Orders per Month',
+                 color='total_orders',
+                 color_continuous_scale='Blues')
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+@st.cache_resource
+def fig_monthly_margin(monthly_sales):
+    fig = px.line(monthly_sales, x='month', y='profit_margin',
+                  title='Profit Margin % Over Time',
+                  markers=True)
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+def get_data():
+    """Ambil df & aggs dari session_state, load ulang hanya kalau file Excel berubah"""
+    mtime = os.path.getmtime(DATA_FILE) if os.path.exists(DATA_FILE) else None
+    key = (DATA_FILE, mtime, CODE_VERSION)
+    if st.session_state.get('data_key') != key:
+        try:
+            df, aggs = load_data(mtime, CODE_VERSION)
+        except Exception as e:
+            st.error(f"Error loading data: {e}")
+            st.info("📁 Pastikan file 'superstore_order.xlsx' ada di folder yang sama")
+            import traceback
+            st.code(traceback.format_exc())
+            return None, None
+        st.session_state['df'], st.session_state['aggs'] = df, aggs
+        st.session_state['data_key'] = key
+    return st.session_state['df'], st.session_state['aggs']
+
+# Tombol refresh: buang cache (memori, disk & Parquet) lalu baca ulang file Excel
+if st.sidebar.button("🔄 Refresh Data"):
+    load_data.clear()
+    st.session_state.pop('data_key', None)
     try:
-        # Load file
-        df = pd.read_excel('superstore_order.xlsx')
-        
-        # Rename kolom: ganti spasi dengan underscore dan lowercase
-        df.columns = df.columns.str.strip().str.replace(' ', '_').str.lower()
-        
-        # Convert numeric columns
-        numeric_cols = ['sales', 'profit', 'quantity', 'discount']
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Convert date columns
-        date_cols = ['order_date', 'ship_date']
-        for col in date_cols:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col], errors='coerce')
-        
-        st.sidebar.success(f"✅ Data loaded: {len(df):,} records")
-        st.sidebar.info(f"📋 Columns: {len(df.columns)}")
-        
-        return df
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
-        st.info("📁 Pastikan file 'superstore_order.xlsx' ada di folder yang sama")
-        import traceback
-        st.code(traceback.format_exc())
-        return None
+        os.remove(CACHE_FILE)
+    except OSError:
+        pass
 
 # Load data
-df = load_data()
+df, aggs = get_data()
 
 if df is None:
     st.error("⚠️ Tidak dapat memuat data.")
     st.stop()
 
+st.sidebar.success(f"✅ Data loaded: {len(df):,} records")
+if st.session_state.get('debug'):
+    st.sidebar.info(f"📋 Columns: {len(df.columns)}")
+
 # Tampilkan kolom yang ada untuk debugging
+# (isi expander tetap dieksekusi walau tertutup, jadi dijaga dengan toggle)
 with st.expander("🔍 Debug: Lihat Struktur Data"):
-    st.write("**Kolom yang tersedia:**")
-    st.write(list(df.columns))
-    st.write("**Sample data (5 baris pertama):**")
-    st.dataframe(df.head())
+    if st.toggle("Tampilkan data debug", value=False, key='debug'):
+        st.write("**Kolom yang tersedia:**")
+        st.write(list(df.columns))
+        st.write("**Sample data (5 baris pertama):**")
+        st.dataframe(df.head())
 
 # Header Dashboard
 st.title("📊 Superstore Analytics Dashboard")
 st.markdown("---")
 
-# Sidebar
-st.sidebar.header("Dashboard Navigation")
-view_option = st.sidebar.radio(
-    "Pilih Analisis:",
-    ["Overview", "Sales Analysis", "Customer Analysis", "Product Analysis", 
-     "Shipping Performance", "Time Series Analysis"]
-)
-
 # OVERVIEW PAGE
-if view_option == "Overview":
+def render_overview(df, aggs):
     st.header("📈 Business Overview")
     
     col1, col2, col3, col4 = st.columns(4)
     
-    total_sales = df['sales'].sum()
-    total_profit = df['profit'].sum()
-    total_orders = df['order_id'].nunique()
+    total_sales = aggs['total_sales']
+    total_profit = aggs['total_profit']
+    total_orders = aggs['total_orders']
     avg_order_value = total_sales / total_orders if total_orders > 0 else 0
     
     with col1:
@@ -96,30 +458,19 @@ if view_option == "Overview":
     with col1:
         st.subheader("💰 Sales by Region")
         if 'region' in df.columns:
-            region_sales = df.groupby('region')['sales'].sum().reset_index()
-            fig1 = px.pie(region_sales, values='sales', names='region', 
-                         title='Distribution of Sales by Region',
-                         color_discrete_sequence=px.colors.sequential.RdBu)
-            st.plotly_chart(fig1, use_container_width=True)
+            st.plotly_chart(fig_region_pie(aggs['region_sales']), use_container_width=True, key='overview_region_pie')
         else:
             st.warning("Kolom 'region' tidak ditemukan")
     
     with col2:
         st.subheader("🚚 Shipping Performance")
         if 'ship_mode' in df.columns and 'order_date' in df.columns and 'ship_date' in df.columns:
-            df['shipping_days'] = (df['ship_date'] - df['order_date']).dt.days
-            shipping = df.groupby('ship_mode')['shipping_days'].mean().reset_index()
-            fig2 = px.bar(shipping, x='ship_mode', y='shipping_days',
-                         title='Average Shipping Days by Mode',
-                         color='shipping_days',
-                         color_continuous_scale='Reds')
-            fig2.update_layout(xaxis_title="Shipping Mode", yaxis_title="Days")
-            st.plotly_chart(fig2, use_container_width=True)
+            st.plotly_chart(fig_shipping_days(aggs['shipping_days']), use_container_width=True, key='overview_shipping_days')
         else:
             st.warning("Kolom shipping tidak lengkap")
 
 # SALES ANALYSIS
-elif view_option == "Sales Analysis":
+def render_sales(df, aggs):
     st.header("💼 Sales Analysis")
     
     col1, col2 = st.columns(2)
@@ -127,242 +478,135 @@ elif view_option == "Sales Analysis":
     with col1:
         st.subheader("📊 Top 10 Products by Sales")
         if 'product_name' in df.columns:
-            top_products = df.groupby('product_name')['sales'].sum().sort_values(ascending=False).head(10).reset_index()
-            fig1 = px.bar(top_products, x='sales', y='product_name',
-                         orientation='h',
-                         color='sales',
-                         color_continuous_scale='Greens',
-                         title='Top 10 Products')
-            fig1.update_layout(yaxis={'categoryorder':'total ascending'})
-            st.plotly_chart(fig1, use_container_width=True)
+            fig1 = fig_top_products(aggs['top_sales'], 'sales', 'Greens', 'Top 10 Products')
+            st.plotly_chart(fig1, use_container_width=True, key='sales_top_sales')
         else:
             st.warning("Kolom 'product_name' tidak ditemukan")
     
     with col2:
         st.subheader("💰 Profit by Product")
         if 'product_name' in df.columns:
-            top_profit = df.groupby('product_name')['profit'].sum().sort_values(ascending=False).head(10).reset_index()
-            fig2 = px.bar(top_profit, x='profit', y='product_name',
-                         orientation='h',
-                         color='profit',
-                         color_continuous_scale='Blues',
-                         title='Top 10 by Profit')
-            fig2.update_layout(yaxis={'categoryorder':'total ascending'})
-            st.plotly_chart(fig2, use_container_width=True)
+            fig2 = fig_top_products(aggs['top_profit'], 'profit', 'Blues', 'Top 10 by Profit')
+            st.plotly_chart(fig2, use_container_width=True, key='sales_top_profit')
     
     # Sales vs Profit scatter
     st.subheader("📈 Sales vs Profit Analysis")
     if 'product_name' in df.columns:
-        product_analysis = df.groupby('product_name').agg({
-            'sales': 'sum',
-            'profit': 'sum'
-        }).reset_index()
-        product_analysis['profit_margin'] = (product_analysis['profit'] / product_analysis['sales'] * 100).fillna(0)
-        
-        # For size parameter, use absolute sales (always positive)
-        # Filter out any rows with invalid data
-        plot_data = product_analysis[product_analysis['sales'] > 0].head(50)
-        
-        fig3 = px.scatter(plot_data, x='sales', y='profit',
-                         size='sales',  # Use sales for size (always positive)
-                         hover_data=['product_name', 'profit_margin'],
-                         title='Sales vs Profit (Top 50 Products)',
-                         color='profit_margin',
-                         color_continuous_scale='RdYlGn')
-        st.plotly_chart(fig3, use_container_width=True)
+        st.plotly_chart(fig_sales_vs_profit(aggs['product_margin']), use_container_width=True, key='sales_vs_profit')
 
 # CUSTOMER ANALYSIS
-elif view_option == "Customer Analysis":
+def render_customers(df, aggs):
     st.header("👥 Customer Analysis")
     
     if 'customer_name' in df.columns:
-        customer_df = df.groupby('customer_name').agg({
-            'order_id': 'nunique',
-            'sales': 'sum',
-            'profit': 'sum'
-        }).reset_index()
-        customer_df.columns = ['customer_name', 'total_orders', 'total_sales', 'total_profit']
-        customer_df = customer_df.sort_values('total_sales', ascending=False).head(15)
+        customer_df = aggs['customers']
         
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("💎 Top 15 Customers by Sales")
-            fig1 = px.bar(customer_df, x='customer_name', y='total_sales',
-                         color='total_sales',
-                         color_continuous_scale='Viridis',
-                         title='Top Customers')
-            fig1.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig1, use_container_width=True)
+            fig1 = fig_customer_bar(customer_df, 'total_sales', 'Viridis', 'Top Customers')
+            st.plotly_chart(fig1, use_container_width=True, key='customers_top_sales')
         
         with col2:
             st.subheader("🎯 Customer Purchase Frequency")
-            fig2 = px.bar(customer_df, x='customer_name', y='total_orders',
-                         color='total_orders',
-                         color_continuous_scale='Blues',
-                         title='Number of Orders')
-            fig2.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig2, use_container_width=True)
+            fig2 = fig_customer_bar(customer_df, 'total_orders', 'Blues', 'Number of Orders')
+            st.plotly_chart(fig2, use_container_width=True, key='customers_orders')
         
         # State analysis
         if 'state' in df.columns:
             st.subheader("🗺️ Sales by State (Top 10)")
-            state_sales = df.groupby('state')['sales'].sum().sort_values(ascending=False).head(10).reset_index()
-            fig3 = px.bar(state_sales, x='state', y='sales',
-                         color='sales',
-                         color_continuous_scale='Plasma',
-                         title='Top 10 States by Sales')
-            st.plotly_chart(fig3, use_container_width=True)
+            st.plotly_chart(fig_state_sales(aggs['state_sales']), use_container_width=True, key='customers_state_sales')
         
         st.dataframe(customer_df, use_container_width=True)
     else:
         st.warning("Kolom 'customer_name' tidak ditemukan")
 
 # PRODUCT ANALYSIS
-elif view_option == "Product Analysis":
+def render_products(df, aggs):
     st.header("📦 Product Analysis")
     
     if 'quantity' in df.columns and 'product_name' in df.columns:
-        product_qty = df.groupby('product_name').agg({
-            'quantity': 'sum',
-            'sales': 'sum',
-            'profit': 'sum'
-        }).reset_index()
-        product_qty.columns = ['product_name', 'total_quantity', 'total_sales', 'total_profit']
-        
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("📊 Top 15 Products by Quantity Sold")
-            top_qty = product_qty.sort_values('total_quantity', ascending=False).head(15)
-            fig1 = px.bar(top_qty, x='product_name', y='total_quantity',
-                         color='total_quantity',
-                         color_continuous_scale='Oranges',
-                         title='Most Sold Products')
-            fig1.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig1, use_container_width=True)
+            st.plotly_chart(fig_top_quantity(aggs['top_qty']), use_container_width=True, key='products_top_qty')
         
         with col2:
             st.subheader("🏷️ Discount Impact")
             if 'discount' in df.columns:
-                discount_analysis = df.groupby('product_name').agg({
-                    'discount': 'mean',
-                    'profit': 'mean'
-                }).reset_index()
-                discount_analysis.columns = ['product_name', 'avg_discount', 'avg_profit']
-                discount_analysis['avg_discount'] = (discount_analysis['avg_discount'] * 100).round(2)
-                discount_analysis = discount_analysis.sort_values('avg_profit', ascending=False).head(15)
-                
-                fig2 = px.scatter(discount_analysis, x='avg_discount', y='avg_profit',
-                                 hover_data=['product_name'],
-                                 title='Discount vs Profit',
-                                 labels={'avg_discount': 'Avg Discount (%)', 
-                                        'avg_profit': 'Avg Profit ($)'})
-                st.plotly_chart(fig2, use_container_width=True)
+                st.plotly_chart(fig_discount_impact(aggs['discount']), use_container_width=True, key='products_discount')
         
-        st.dataframe(product_qty.sort_values('total_sales', ascending=False).head(20), use_container_width=True)
+        st.dataframe(aggs['top_product_sales'], use_container_width=True)
     else:
         st.warning("Data produk tidak lengkap")
 
 # SHIPPING PERFORMANCE
-elif view_option == "Shipping Performance":
+def render_shipping(df, aggs):
     st.header("🚚 Shipping Performance Analysis")
     
     if 'ship_mode' in df.columns and 'order_date' in df.columns and 'ship_date' in df.columns:
-        df['shipping_days'] = (df['ship_date'] - df['order_date']).dt.days
-        
-        shipping_df = df.groupby('ship_mode').agg({
-            'order_id': 'count',
-            'shipping_days': 'mean',
-            'sales': 'sum'
-        }).reset_index()
-        shipping_df.columns = ['ship_mode', 'total_orders', 'avg_shipping_days', 'total_sales']
-        shipping_df['avg_shipping_days'] = shipping_df['avg_shipping_days'].round(1)
-        shipping_df = shipping_df.sort_values('avg_shipping_days')
+        shipping_df = aggs['shipping']
         
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("⏱️ Average Shipping Days")
-            fig1 = px.bar(shipping_df, x='ship_mode', y='avg_shipping_days',
-                         color='avg_shipping_days',
-                         color_continuous_scale='RdYlGn_r',
-                         title='Delivery Speed by Shipping Mode',
-                         text='avg_shipping_days')
-            fig1.update_traces(texttemplate='%{text:.1f} days', textposition='outside')
-            st.plotly_chart(fig1, use_container_width=True)
+            st.plotly_chart(fig_shipping_speed(shipping_df), use_container_width=True, key='shipping_speed')
         
         with col2:
             st.subheader("📦 Order Distribution")
-            fig2 = px.pie(shipping_df, values='total_orders', names='ship_mode',
-                         title='Orders by Shipping Mode',
-                         color_discrete_sequence=px.colors.sequential.Plasma)
-            st.plotly_chart(fig2, use_container_width=True)
+            st.plotly_chart(fig_shipping_orders(shipping_df), use_container_width=True, key='shipping_orders')
         
         st.subheader("💰 Sales by Shipping Mode")
-        fig3 = px.bar(shipping_df, x='ship_mode', y='total_sales',
-                     color='total_sales',
-                     color_continuous_scale='Greens',
-                     title='Revenue by Shipping Method')
-        st.plotly_chart(fig3, use_container_width=True)
+        st.plotly_chart(fig_shipping_sales(shipping_df), use_container_width=True, key='shipping_sales')
         
         st.dataframe(shipping_df, use_container_width=True)
     else:
         st.warning("Data shipping tidak lengkap")
 
 # TIME SERIES ANALYSIS
-elif view_option == "Time Series Analysis":
+def render_time_series(df, aggs):
     st.header("📅 Time Series Analysis")
     
     if 'order_date' in df.columns:
         # Monthly trend
-        df['year_month'] = df['order_date'].dt.to_period('M').astype(str)
-        
-        monthly_sales = df.groupby('year_month').agg({
-            'sales': 'sum',
-            'profit': 'sum',
-            'order_id': 'nunique'
-        }).reset_index()
-        monthly_sales.columns = ['month', 'total_sales', 'total_profit', 'total_orders']
+        monthly_sales = aggs['monthly']
         
         st.subheader("📈 Monthly Sales & Profit Trend")
-        fig1 = go.Figure()
-        fig1.add_trace(go.Scatter(x=monthly_sales['month'], y=monthly_sales['total_sales'],
-                                  mode='lines+markers', name='Sales',
-                                  line=dict(color='blue', width=2)))
-        fig1.add_trace(go.Scatter(x=monthly_sales['month'], y=monthly_sales['total_profit'],
-                                  mode='lines+markers', name='Profit',
-                                  line=dict(color='green', width=2)))
-        fig1.update_layout(title='Sales & Profit Over Time',
-                          xaxis_title='Month',
-                          yaxis_title='Amount ($)',
-                          hovermode='x unified')
-        st.plotly_chart(fig1, use_container_width=True)
+        st.plotly_chart(fig_monthly_trend(monthly_sales), use_container_width=True, key='time_trend')
         
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("📊 Monthly Order Count")
-            fig2 = px.bar(monthly_sales, x='month', y='total_orders',
-                         title='Orders per Month',
-                         color='total_orders',
-                         color_continuous_scale='Blues')
-            fig2.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig2, use_container_width=True)
+            st.plotly_chart(fig_monthly_orders(monthly_sales), use_container_width=True, key='time_orders')
         
         with col2:
             st.subheader("💹 Profit Margin Trend")
-            monthly_sales['profit_margin'] = (monthly_sales['total_profit'] / monthly_sales['total_sales'] * 100).round(2)
-            fig3 = px.line(monthly_sales, x='month', y='profit_margin',
-                          title='Profit Margin % Over Time',
-                          markers=True)
-            fig3.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig3, use_container_width=True)
+            st.plotly_chart(fig_monthly_margin(monthly_sales), use_container_width=True, key='time_margin')
         
         st.dataframe(monthly_sales, use_container_width=True)
     else:
         st.warning("Kolom 'order_date' tidak ditemukan")
 
+# Tiap halaman cukup dipanggil lewat dict, hanya fungsi yang dipilih yang dijalankan
+VIEWS = {
+    "Overview": render_overview,
+    "Sales Analysis": render_sales,
+    "Customer Analysis": render_customers,
+    "Product Analysis": render_products,
+    "Shipping Performance": render_shipping,
+    "Time Series Analysis": render_time_series,
+}
+
+# Sidebar
+st.sidebar.header("Dashboard Navigation")
+view_option = st.sidebar.radio("Pilih Analisis:", list(VIEWS))
+
+VIEWS[view_option](df, aggs)
+
 # Footer
 st.markdown("---")
 st.markdown("Dashboard created with Streamlit & Plotly | Data: Superstore Analytics")
\ No newline at end of file
@@ -0,0 +1,73 @@
+-- Migrasi skema superstore_order, aman dijalankan ulang.
+-- Jalankan sekali sebelum Script-5.sql: psql -d <database> -f migrate_superstore.sql
+BEGIN;
+
+-- View bergantung pada sales/profit, jadi dibuang dulu supaya tipe kolomnya bisa diubah,
+-- lalu dibuat ulang di bawah (sekaligus mengganti definisi lama yang masih pakai ::NUMERIC)
+DROP MATERIALIZED VIEW IF EXISTS mv_profit_by_category;
+
+-- Simpan angka sebagai tipe native supaya SUM/AVG tidak lewat NUMERIC per baris.
+-- Hanya diubah kalau belum (ALTER TYPE selalu menulis ulang seluruh tabel)
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'superstore_order'
+          AND column_name = 'sales'
+          AND data_type <> 'double precision'
+    ) THEN
+        ALTER TABLE superstore_order
+            ALTER COLUMN sales TYPE double precision USING sales::double precision,
+            ALTER COLUMN profit TYPE double precision USING profit::double precision,
+            ALTER COLUMN discount TYPE double precision USING discount::double precision,
+            ALTER COLUMN quantity TYPE integer USING quantity::integer;
+    END IF;
+END $$;
+
+-- Tanggal disimpan sebagai date (dibutuhkan generated column di bawah: cast text -> date
+-- tidak immutable). Dilewati kalau sudah date, karena shipping_days bergantung pada kolom ini
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'superstore_order'
+          AND column_name = 'order_date'
+          AND data_type <> 'date'
+    ) THEN
+        ALTER TABLE superstore_order
+            ALTER COLUMN order_date TYPE date USING order_date::date,
+            ALTER COLUMN ship_date TYPE date USING ship_date::date;
+    END IF;
+END $$;
+
+-- Lama pengiriman dihitung sekali saat data masuk (generated column, ikut terisi saat INSERT/UPDATE)
+ALTER TABLE superstore_order
+    ADD COLUMN IF NOT EXISTS shipping_days smallint GENERATED ALWAYS AS (ship_date - order_date) STORED;
+
+-- Index untuk kolom JOIN / GROUP BY di query Script-5.sql
+CREATE INDEX IF NOT EXISTS superstore_order_product_id_idx ON superstore_order (product_id);
+CREATE INDEX IF NOT EXISTS superstore_order_customer_id_idx ON superstore_order (customer_id);
+CREATE INDEX IF NOT EXISTS superstore_order_ship_mode_idx
+    ON superstore_order (ship_mode) INCLUDE (order_id, shipping_days);
+CREATE INDEX IF NOT EXISTS superstore_product_category_idx
+    ON superstore_product (category, sub_category);
+
+CREATE MATERIALIZED VIEW mv_profit_by_category AS
+SELECT
+    sp.category,
+    sp.sub_category,
+    ROUND(SUM(so.sales)::NUMERIC, 2) AS total_sales,
+    ROUND(SUM(so.profit)::NUMERIC, 2) AS total_profit,
+    ROUND((SUM(so.profit) / SUM(so.sales) * 100)::NUMERIC, 2) AS profit_margin_percentage
+FROM superstore_order so
+JOIN superstore_product sp ON so.product_id = sp.product_id
+GROUP BY sp.category, sp.sub_category;
+
+CREATE UNIQUE INDEX mv_profit_by_category_key
+    ON mv_profit_by_category (category, sub_category);
+
+COMMIT;
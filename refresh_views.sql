@@ -0,0 +1,4 @@
+-- Refresh materialized view, dijadwalkan terpisah (mis. cron tiap malam):
+--   psql -d <database> -f refresh_views.sql
+-- CONCURRENTLY butuh unique index mv_profit_by_category_key dan tidak memblokir SELECT
+REFRESH MATERIALIZED VIEW CONCURRENTLY mv_profit_by_category;